@@ -1,26 +1,48 @@
 import streamlit as st
 import json
 import os
+import re
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Dict, List, Any
-from chatbot import EnhancedChatbot, initialize_sample_data
-import time
 
-# Import the chatbot (assuming the main code is in chatbot.py)
-# from chatbot import EnhancedChatbot, initialize_sample_data, load_json
-
-# For demo purposes, we'll create a simplified version
-class SimplifiedChatbot:
-    def __init__(self):
-        self.memory = []
-        self.context = {}
-    
-    def process_message(self, user_input: str) -> str:
-        """Simplified message processing for demo"""
-        lower_input = user_input.lower()
-        
-        if 'search' in lower_input or 'find' in lower_input or 'product' in lower_input:
-            return """🔍 **Product Search Results**
+# Keyword -> intent table for the demo dispatcher. Insertion order is the
+# priority used when a message mentions more than one topic.
+_INTENT_KEYWORDS = {
+    "search": "search",
+    "find": "search",
+    "product": "search",
+    "sale": "sales",
+    "transaction": "sales",
+    "analytics": "analytics",
+    "report": "analytics",
+    "recommend": "recommend",
+    "suggest": "recommend",
+    "vendor": "vendor",
+    "hello": "greeting",
+    "hi": "greeting",
+}
+_INTENT_PRIORITY = {
+    intent: rank for rank, intent in enumerate(dict.fromkeys(_INTENT_KEYWORDS.values()))
+}
+# Keywords that only count as whole words ("hi" must not match "this")
+_WHOLE_WORD_KEYWORDS = {"hi"}
+# One alternation over every keyword, so a message is scanned once instead of
+# once per keyword. Matches are anchored at a word start so "products" and
+# "sales" still count but "wholesale" does not.
+_KEYWORD_RE = re.compile(r"\b(?:" + "|".join(
+    re.escape(k) + (r"\b" if k in _WHOLE_WORD_KEYWORDS else "")
+    for k in sorted(_INTENT_KEYWORDS, key=len, reverse=True)
+) + ")")
+
+def _detect_intent(lower_input: str) -> Optional[str]:
+    """Return the highest-priority intent mentioned in the input"""
+    intents = {_INTENT_KEYWORDS[m.group()] for m in _KEYWORD_RE.finditer(lower_input)}
+    return min(intents, key=_INTENT_PRIORITY.__getitem__, default=None)
+
+# Canned demo responses, keyed by intent
+_RESP_SEARCH = """🔍 **Product Search Results**
 
 I found 3 products matching your search:
 
@@ -49,9 +71,8 @@ I found 3 products matching your search:
    • Stock: 15 units available
 
 Would you like more details on any of these products?"""
-        
-        elif 'sale' in lower_input or 'transaction' in lower_input:
-            return """💰 **Sales Records**
+
+_RESP_SALES = """💰 **Sales Records**
 
 I found 2 recent sales:
 
@@ -70,9 +91,8 @@ I found 2 recent sales:
    • Items: 1 product
 
 Would you like to see more details or filter by customer?"""
-        
-        elif 'analytics' in lower_input or 'report' in lower_input:
-            return """📊 **Sales Analytics Summary**
+
+_RESP_ANALYTICS = """📊 **Sales Analytics Summary**
 
 • Total Sales: 89
 • Total Revenue: ₹24,56,789
@@ -89,9 +109,8 @@ Would you like to see more details or filter by customer?"""
 5. Levi's 501 Jeans - 10 units
 
 📈 Trend: Sales are up 15% from last month!"""
-        
-        elif 'recommend' in lower_input or 'suggest' in lower_input:
-            return """⭐ **Product Recommendations**
+
+_RESP_RECOMMEND = """⭐ **Product Recommendations**
 
 Based on your preferences, here are my top recommendations:
 
@@ -109,9 +128,8 @@ Based on your preferences, here are my top recommendations:
    • 200MP camera + S Pen
    • Price: ₹89,999
    • Best Android flagship"""
-        
-        elif 'vendor' in lower_input:
-            return """🏢 **Vendor Information**
+
+_RESP_VENDOR = """🏢 **Vendor Information**
 
 Here are our registered vendors:
 
@@ -126,9 +144,8 @@ Here are our registered vendors:
    • Contact: Priya Sharma
    • Email: priya@fashionwholesale.com
    • Phone: +91-9876543211"""
-        
-        elif 'hello' in lower_input or 'hi' in lower_input:
-            return """👋 Hello! I'm your Veract AI Sales Assistant.
+
+_RESP_GREETING = """👋 Hello! I'm your Veract AI Sales Assistant.
 
 I can help you with:
 • 🔍 Search products
@@ -138,9 +155,8 @@ I can help you with:
 • 🏢 Manage vendors
 
 What would you like to do today?"""
-        
-        else:
-            return """I'm here to help! I can assist you with:
+
+_RESP_DEFAULT = """I'm here to help! I can assist you with:
 
 🔍 **Search** - Find products or sales
 📦 **Product Details** - View complete information
@@ -150,16 +166,28 @@ What would you like to do today?"""
 
 What would you like to explore?"""
 
-# Page configuration
-st.set_page_config(
-    page_title="Veract AI Sales Assistant",
-    page_icon="🤖",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Custom CSS
-st.markdown("""
+_RESP_TABLE = {
+    "search": _RESP_SEARCH,
+    "sales": _RESP_SALES,
+    "analytics": _RESP_ANALYTICS,
+    "recommend": _RESP_RECOMMEND,
+    "vendor": _RESP_VENDOR,
+    "greeting": _RESP_GREETING,
+}
+
+# Maximum number of chat messages kept in a session
+MAX_HISTORY = 200
+
+# Sidebar quick actions: (button label, prompt sent to the chatbot)
+QUICK_ACTIONS = [
+    ("🔍 Search Products", "Show me all products"),
+    ("📊 View Analytics", "Show analytics"),
+    ("⭐ Get Recommendations", "Recommend products"),
+    ("💰 Recent Sales", "Show recent sales"),
+]
+
+# Static page markup
+_CUSTOM_CSS = """
 <style>
     .main {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -202,14 +230,140 @@ st.markdown("""
         margin-top: 0.5rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_FOOTER_HTML = """
+<div style="text-align: center; color: #6b7280; font-size: 0.875rem;">
+    <p>AI-powered chatbot with LangGraph orchestration | Natural language understanding</p>
+    <p>Features: Product search, Sales tracking, Analytics, Vendor management, Smart recommendations</p>
+</div>
+"""
+
+@lru_cache(maxsize=512)
+def _dispatch(lower_input: str) -> str:
+    """Canned response for a lowercased message, memoized per input"""
+    return _RESP_TABLE.get(_detect_intent(lower_input), _RESP_DEFAULT)
+
+# Chat bubble markup, filled per message by _render_message
+_MSG_TEMPLATE = """
+        <div class="chat-message {bubble_class}">
+            <div><strong>{role_label}</strong></div>
+            <div>{content}</div>
+            <div style="font-size: 0.75rem; opacity: 0.7; margin-top: 0.5rem;">
+                {time_str}
+            </div>
+        </div>
+        """
+
+# role -> (bubble CSS class, label)
+_MSG_ROLES = {
+    "user": ("user-message", "You"),
+    "assistant": ("assistant-message", "🤖 Assistant"),
+}
+
+# For demo purposes, we'll create a simplified version
+class SimplifiedChatbot:
+    def __init__(self):
+        self.memory = []
+        self.context = {}
+    
+    def process_message(self, user_input: str) -> str:
+        """Simplified message processing for demo"""
+        return _dispatch(user_input.lower())
+
+@st.cache_resource
+def get_chatbot() -> SimplifiedChatbot:
+    """Process-wide chatbot instance shared by every session"""
+    return SimplifiedChatbot()
+
+def _start_history(content: str):
+    """Start a new conversation with a single assistant message.
+
+    History is kept as parallel lists (roles, contents, display times)
+    rather than one dict per message, each capped at MAX_HISTORY entries
+    so the oldest messages drop off and every rerun renders a bounded
+    amount of HTML.
+    """
+    st.session_state.msg_roles = deque(["assistant"], maxlen=MAX_HISTORY)
+    st.session_state.msg_contents = deque([content], maxlen=MAX_HISTORY)
+    st.session_state.msg_times = deque([datetime.now().strftime("%I:%M %p")], maxlen=MAX_HISTORY)
+
+def _append_message(role: str, content: str):
+    """Append one message to the conversation history"""
+    st.session_state.msg_roles.append(role)
+    st.session_state.msg_contents.append(content)
+    st.session_state.msg_times.append(datetime.now().strftime("%I:%M %p"))
+
+def _handle_prompt(prompt: str):
+    """Append a user prompt and the chatbot's reply to the conversation"""
+    _append_message("user", prompt)
+    _append_message("assistant", get_chatbot().process_message(prompt))
+
+def _on_send():
+    """Send button callback: runs before the rerun that redraws the chat"""
+    user_input = st.session_state.user_input
+    if user_input:
+        _handle_prompt(user_input)
+
+def _reset_conversation():
+    """Reset button callback"""
+    _start_history("🔄 **Memory Reset!**\n\nStarting a fresh conversation. How can I help you today?")
+
+@st.cache_data
+def _render_stat_cards(stats_items: tuple) -> tuple:
+    """Render the four dashboard stat cards, cached per stats snapshot"""
+    stats = dict(stats_items)
+    return (
+        f"""
+        <div class="stat-card">
+            <div class="stat-value">{stats['total_products']}</div>
+            <div class="stat-label">📦 Total Products</div>
+        </div>
+        """,
+        f"""
+        <div class="stat-card">
+            <div class="stat-value">{stats['total_sales']}</div>
+            <div class="stat-label">💰 Total Sales</div>
+        </div>
+        """,
+        f"""
+        <div class="stat-card">
+            <div class="stat-value">₹{stats['revenue']/100000:.1f}L</div>
+            <div class="stat-label">📈 Revenue</div>
+        </div>
+        """,
+        f"""
+        <div class="stat-card">
+            <div class="stat-value">{stats['pending_sales']}</div>
+            <div class="stat-label">⏳ Pending</div>
+        </div>
+        """,
+    )
+
+def _render_message(role: str, content: str, time_str: str) -> str:
+    """Render one chat message as HTML"""
+    bubble_class, role_label = _MSG_ROLES[role]
+    return _MSG_TEMPLATE.format_map({
+        "bubble_class": bubble_class,
+        "role_label": role_label,
+        "content": content,
+        "time_str": time_str
+    })
+
+# Page configuration
+st.set_page_config(
+    page_title="Veract AI Sales Assistant",
+    page_icon="🤖",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS
+st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
 
 # Initialize session state
-if 'messages' not in st.session_state:
-    st.session_state.messages = [
-        {
-            "role": "assistant",
-            "content": """🤖 **Welcome to Veract AI Sales Assistant!**
+if 'msg_roles' not in st.session_state:
+    _start_history("""🤖 **Welcome to Veract AI Sales Assistant!**
 
 I can help you with:
 • 🔍 Search and filter products
@@ -219,13 +373,7 @@ I can help you with:
 • 🏢 Manage vendor information
 • ➕ Create and update products/sales
 
-Just chat naturally - I'll understand what you need!""",
-            "timestamp": datetime.now().isoformat()
-        }
-    ]
-
-if 'chatbot' not in st.session_state:
-    st.session_state.chatbot = SimplifiedChatbot()
+Just chat naturally - I'll understand what you need!""")
 
 if 'stats' not in st.session_state:
     st.session_state.stats = {
@@ -246,114 +394,36 @@ with st.sidebar:
     st.header("📊 Dashboard")
     
     # Stats
+    products_html, sales_html, revenue_html, pending_html = _render_stat_cards(
+        tuple(sorted(st.session_state.stats.items()))
+    )
     col1, col2 = st.columns(2)
     with col1:
-        st.markdown(f"""
-        <div class="stat-card">
-            <div class="stat-value">{st.session_state.stats['total_products']}</div>
-            <div class="stat-label">📦 Total Products</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(products_html, unsafe_allow_html=True)
     
     with col2:
-        st.markdown(f"""
-        <div class="stat-card">
-            <div class="stat-value">{st.session_state.stats['total_sales']}</div>
-            <div class="stat-label">💰 Total Sales</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(sales_html, unsafe_allow_html=True)
     
     col3, col4 = st.columns(2)
     with col3:
-        st.markdown(f"""
-        <div class="stat-card">
-            <div class="stat-value">₹{st.session_state.stats['revenue']/100000:.1f}L</div>
-            <div class="stat-label">📈 Revenue</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(revenue_html, unsafe_allow_html=True)
     
     with col4:
-        st.markdown(f"""
-        <div class="stat-card">
-            <div class="stat-value">{st.session_state.stats['pending_sales']}</div>
-            <div class="stat-label">⏳ Pending</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(pending_html, unsafe_allow_html=True)
     
     st.markdown("---")
     
     # Quick Actions
     st.header("⚡ Quick Actions")
     
-    if st.button("🔍 Search Products", use_container_width=True):
-        st.session_state.messages.append({
-            "role": "user",
-            "content": "Show me all products",
-            "timestamp": datetime.now().isoformat()
-        })
-        response = st.session_state.chatbot.process_message("Show me all products")
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": response,
-            "timestamp": datetime.now().isoformat()
-        })
-        st.rerun()
-    
-    if st.button("📊 View Analytics", use_container_width=True):
-        st.session_state.messages.append({
-            "role": "user",
-            "content": "Show analytics",
-            "timestamp": datetime.now().isoformat()
-        })
-        response = st.session_state.chatbot.process_message("Show analytics")
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": response,
-            "timestamp": datetime.now().isoformat()
-        })
-        st.rerun()
-    
-    if st.button("⭐ Get Recommendations", use_container_width=True):
-        st.session_state.messages.append({
-            "role": "user",
-            "content": "Recommend products",
-            "timestamp": datetime.now().isoformat()
-        })
-        response = st.session_state.chatbot.process_message("Recommend products")
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": response,
-            "timestamp": datetime.now().isoformat()
-        })
-        st.rerun()
-    
-    if st.button("💰 Recent Sales", use_container_width=True):
-        st.session_state.messages.append({
-            "role": "user",
-            "content": "Show recent sales",
-            "timestamp": datetime.now().isoformat()
-        })
-        response = st.session_state.chatbot.process_message("Show recent sales")
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": response,
-            "timestamp": datetime.now().isoformat()
-        })
-        st.rerun()
+    for label, prompt in QUICK_ACTIONS:
+        st.button(label, use_container_width=True, on_click=_handle_prompt, args=(prompt,))
     
     st.markdown("---")
     
     # Settings
     st.header("⚙️ Settings")
-    if st.button("🔄 Reset Conversation", use_container_width=True):
-        st.session_state.messages = [
-            {
-                "role": "assistant",
-                "content": "🔄 **Memory Reset!**\n\nStarting a fresh conversation. How can I help you today?",
-                "timestamp": datetime.now().isoformat()
-            }
-        ]
-        st.rerun()
+    st.button("🔄 Reset Conversation", use_container_width=True, on_click=_reset_conversation)
     
     st.markdown("---")
     st.caption("© 2025 Veract Consultancy Pvt Ltd")
@@ -363,35 +433,25 @@ with st.sidebar:
 chat_container = st.container()
 
 with chat_container:
-    # Display messages
-    for message in st.session_state.messages:
-        if message["role"] == "user":
-            st.markdown(f"""
-            <div class="chat-message user-message">
-                <div><strong>You</strong></div>
-                <div>{message["content"]}</div>
-                <div style="font-size: 0.75rem; opacity: 0.7; margin-top: 0.5rem;">
-                    {datetime.fromisoformat(message["timestamp"]).strftime("%I:%M %p")}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            st.markdown(f"""
-            <div class="chat-message assistant-message">
-                <div><strong>🤖 Assistant</strong></div>
-                <div>{message["content"]}</div>
-                <div style="font-size: 0.75rem; opacity: 0.7; margin-top: 0.5rem;">
-                    {datetime.fromisoformat(message["timestamp"]).strftime("%I:%M %p")}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+    # Display messages in a single markdown call
+    st.markdown(
+        "\n".join(
+            _render_message(role, content, time_str)
+            for role, content, time_str in zip(
+                st.session_state.msg_roles,
+                st.session_state.msg_contents,
+                st.session_state.msg_times
+            )
+        ),
+        unsafe_allow_html=True
+    )
 
 # Input area
 st.markdown("---")
 col1, col2 = st.columns([6, 1])
 
 with col1:
-    user_input = st.text_input(
+    st.text_input(
         "Message",
         placeholder="Ask me anything about products, sales, analytics...",
         key="user_input",
@@ -399,37 +459,8 @@ with col1:
     )
 
 with col2:
-    send_button = st.button("Send 📤", use_container_width=True)
-
-# Process input
-if send_button and user_input:
-    # Add user message
-    st.session_state.messages.append({
-        "role": "user",
-        "content": user_input,
-        "timestamp": datetime.now().isoformat()
-    })
-    
-    # Get bot response
-    with st.spinner("Thinking..."):
-        time.sleep(0.5)  # Simulate processing
-        response = st.session_state.chatbot.process_message(user_input)
-    
-    # Add assistant response
-    st.session_state.messages.append({
-        "role": "assistant",
-        "content": response,
-        "timestamp": datetime.now().isoformat()
-    })
-    
-    # Rerun to update chat
-    st.rerun()
+    st.button("Send 📤", use_container_width=True, on_click=_on_send)
 
 # Footer
 st.markdown("---")
-st.markdown("""
-<div style="text-align: center; color: #6b7280; font-size: 0.875rem;">
-    <p>AI-powered chatbot with LangGraph orchestration | Natural language understanding</p>
-    <p>Features: Product search, Sales tracking, Analytics, Vendor management, Smart recommendations</p>
-</div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
\ No newline at end of file
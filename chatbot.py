@@ -1,27 +1,79 @@
+import asyncio
+import copy
+import hashlib
+import heapq
+import inspect
 import json
+import logging
 import os
-from groq import Groq
+import re
+import shutil
+import threading
+import time
+import atexit
+import httpx
+from groq import AsyncGroq
 from datetime import datetime
-from typing import Optional, Dict, List, Any, Annotated
+from typing import Optional, Dict, List, Any, Annotated, Callable
 from dataclasses import dataclass, field
 from enum import Enum
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
 import operator
 
+try:
+    import orjson
+except ImportError:  # optional; the stdlib json module is used instead
+    orjson = None
+
 # LangGraph imports
 from langgraph.graph import StateGraph, END
 from typing_extensions import TypedDict
 
+logger = logging.getLogger(__name__)
+
 # Initialize Groq client
 
 import os
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+# One pooled HTTP client for every LLM call. Idle connections are kept for
+# two minutes (httpx defaults to 5s) so a user's pause between messages
+# doesn't cost a new TLS handshake on the next turn.
+_http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=120),
+    timeout=httpx.Timeout(60.0, connect=5.0)
+)
+aclient = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), http_client=_http_client)
+
+# Caps concurrent in-flight LLM calls across sessions
+_LLM_SEMAPHORE = asyncio.Semaphore(8)
+
+# Receives general-chat reply text as it streams in, for the current turn
+_token_sink: ContextVar[Optional[Callable[[str], None]]] = ContextVar("_token_sink", default=None)
 
 # Database paths
 PRODUCTS_DB = "products.json"
 SALES_DB = "sales.json"
 VENDORS_DB = "vendors.json"
 
+# Allowed product categories and sale payment statuses
+_CATEGORY_NAMES = ("Electronics", "Grocery", "Fashion", "Home", "Sports")
+_STATUS_NAMES = ("PAID", "PENDING", "CANCELLED")
+VALID_CATEGORIES = frozenset(_CATEGORY_NAMES)
+VALID_STATUSES = frozenset(_STATUS_NAMES)
+VALID_CATEGORIES_LIST_STR = ", ".join(_CATEGORY_NAMES)
+VALID_STATUSES_LIST_STR = ", ".join(_STATUS_NAMES)
+
+def _is_valid_category(value: Any) -> bool:
+    """True for a known category name; LLM entities may hold lists or dicts"""
+    return isinstance(value, str) and value in VALID_CATEGORIES
+
+def _is_valid_status(value: Any) -> bool:
+    """True for a known payment status; LLM entities may hold lists or dicts"""
+    return isinstance(value, str) and value in VALID_STATUSES
+
 # Agent types
 class AgentType(Enum):
     CONVERSATION_MANAGER = "conversation_manager"
@@ -30,6 +82,42 @@ class AgentType(Enum):
     ANALYTICS_AGENT = "analytics_agent"
     VENDOR_AGENT = "vendor_agent"
 
+# Most search results remembered in the session context
+MAX_CONTEXT_SEARCH_RESULTS = 20
+# Most messages kept in session memory; older ones are dropped
+MAX_SESSION_MESSAGES = 50
+# Search results, and characters overall, in the context given to general chat
+CHAT_CONTEXT_RESULTS = 5
+CHAT_CONTEXT_MAX_CHARS = 2000
+
+def _compact_json(obj: Any) -> str:
+    """Serialize to JSON without whitespace (orjson when available)"""
+    if orjson:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+def _default_user_preferences() -> Dict[str, Any]:
+    """Empty user preference slots"""
+    return {
+        "price_range": None,
+        "preferred_categories": [],
+        "preferred_brands": []
+    }
+
+@dataclass(slots=True)
+class SessionContext:
+    """Conversation context tracked across turns"""
+    last_product: Optional[dict] = None
+    last_product_id: Optional[str] = None
+    last_filters: Dict[str, Any] = field(default_factory=dict)
+    last_search_results: List[dict] = field(default_factory=list)
+    current_topic: Optional[str] = None
+    user_preferences: Dict[str, Any] = field(default_factory=_default_user_preferences)
+    session_start: str = field(default_factory=lambda: datetime.now().isoformat())
+    customer_id: Optional[str] = None
+    last_sale: Optional[dict] = None
+    conversation_count: int = 0
+
 # LangGraph State
 class ConversationState(TypedDict):
     """State passed between nodes in the graph"""
@@ -38,33 +126,24 @@ class ConversationState(TypedDict):
     intent: Optional[str]
     entities: Dict[str, Any]
     conversation_history: Annotated[List[Dict], operator.add]
-    context: Dict[str, Any]
+    context: SessionContext
     pending_confirmation: Optional[Dict[str, Any]]
     validation_errors: List[str]
     tool_calls: List[Dict[str, Any]]
     requires_followup: bool
 
 class SessionMemory:
-    """Enhanced memory with context tracking"""
+    """Enhanced memory with context tracking.
+
+    Change the context through the methods below so the cached
+    serialized view behind get_context_string() stays current. Only the last
+    MAX_SESSION_MESSAGES messages are kept.
+    """
     def __init__(self):
-        self.messages = []
-        self.context = {
-            "last_product": None,
-            "last_product_id": None,
-            "last_filters": {},
-            "last_search_results": [],
-            "current_topic": None,
-            "user_preferences": {
-                "price_range": None,
-                "preferred_categories": [],
-                "preferred_brands": []
-            },
-            "session_start": datetime.now().isoformat(),
-            "customer_id": None,
-            "last_sale": None,
-            "conversation_count": 0
-        }
+        self.messages = deque(maxlen=MAX_SESSION_MESSAGES)
+        self.context = SessionContext()
         self.pending_actions = []
+        self._context_json: Optional[str] = None
     
     def add_message(self, role: str, content: str):
         """Add message with timestamp"""
@@ -73,24 +152,88 @@ class SessionMemory:
             "content": content,
             "timestamp": datetime.now().isoformat()
         })
-        self.context["conversation_count"] += 1
+        self.context.conversation_count += 1
     
     def update_context(self, key: str, value: Any):
         """Update specific context key"""
-        self.context[key] = value
+        setattr(self.context, key, value)
+        self._context_json = None
     
     def update_user_preferences(self, preference_type: str, value: Any):
         """Update user preferences"""
-        if preference_type in self.context["user_preferences"]:
-            self.context["user_preferences"][preference_type] = value
+        if preference_type in self.context.user_preferences:
+            self.context.user_preferences[preference_type] = value
+            self._context_json = None
     
     def get_context_string(self) -> str:
-        """Get formatted context"""
-        return json.dumps(self.context, indent=2)
+        """Get context as compact JSON.
+
+        Records are reduced to their identifying fields and the result is
+        cut at CHAT_CONTEXT_MAX_CHARS, so the general chat prompt stays
+        bounded however much the session has accumulated. Only the
+        message count, which changes every turn, is serialized each call.
+        """
+        # Splice the count in as the last key of the cached JSON object
+        text = (
+            self.get_reply_cache_context()[:-1]
+            + f',"conversation_count":{self.context.conversation_count}}}'
+        )
+        if len(text) > CHAT_CONTEXT_MAX_CHARS:
+            text = text[:CHAT_CONTEXT_MAX_CHARS] + "…"
+        return text
+    
+    def get_reply_cache_context(self) -> str:
+        """Chat prompt context without the per-turn conversation_count.
+
+        General replies are cached under this, so a reply is only reused
+        when everything else the prompt showed the model is the same.
+        Serialized once per context change.
+        """
+        if self._context_json is None:
+            self._context_json = _compact_json(self._context_view())
+        return self._context_json
+    
+    def _context_view(self) -> Dict[str, Any]:
+        """Identifying fields of the context shown to the general chat prompt"""
+        context = self.context
+        last_product = context.last_product
+        last_sale = context.last_sale
+        return {
+            "current_topic": context.current_topic,
+            "last_product": {"id": last_product.get("id"), "name": last_product.get("name")} if last_product else None,
+            "last_product_id": context.last_product_id,
+            "last_filters": context.last_filters,
+            "last_search_results": [
+                {"id": r.get("id"), "name": r.get("name")}
+                for r in context.last_search_results[:CHAT_CONTEXT_RESULTS]
+            ],
+            "user_preferences": context.user_preferences,
+            "customer_id": context.customer_id,
+            "last_sale": {
+                "id": last_sale.get("id"),
+                "total": last_sale.get("total"),
+                "payment_status": last_sale.get("payment_status")
+            } if last_sale else None
+        }
+    
+    def get_nlu_context(self) -> Dict[str, Any]:
+        """Small view of the context that intent extraction needs.
+
+        Leaves out full product/sale records so the NLU prompt stays the
+        same size however long the session runs.
+        """
+        context = self.context
+        return {
+            "current_topic": context.current_topic,
+            "last_product_id": context.last_product_id,
+            "last_search_result_ids": [r.get("id") for r in context.last_search_results[:3]],
+            "customer_id": context.customer_id,
+            "last_sale_id": context.last_sale.get("id") if context.last_sale else None
+        }
     
     def get_recent_messages(self, n: int = 5) -> List[Dict]:
         """Get last n messages"""
-        return self.messages[-n:]
+        return list(self.messages)[-n:]
     
     def add_pending_action(self, action: Dict[str, Any]):
         """Add action that requires confirmation"""
@@ -106,48 +249,377 @@ class SessionMemory:
     
     def reset(self):
         """Reset memory"""
-        self.messages = []
-        self.context = {
-            "last_product": None,
-            "last_product_id": None,
-            "last_filters": {},
-            "last_search_results": [],
-            "current_topic": None,
-            "user_preferences": {
-                "price_range": None,
-                "preferred_categories": [],
-                "preferred_brands": []
-            },
-            "session_start": datetime.now().isoformat(),
-            "customer_id": None,
-            "last_sale": None,
-            "conversation_count": 0
-        }
+        self.messages = deque(maxlen=MAX_SESSION_MESSAGES)
+        self.context = SessionContext()
         self.pending_actions = []
+        self._context_json = None
 
 # Database utilities
-def load_json(filepath: str) -> dict:
-    """Load JSON database"""
+# Parsed databases keyed by path -> ((mtime_ns, size), data, indexes). A
+# cached entry is served for as long as the file on disk is unchanged;
+# indexes holds lookup structures derived from data, built on first use.
+_JSON_CACHE: Dict[str, tuple] = {}
+
+def _positions_by_id(items: List[dict]) -> Dict[str, int]:
+    """Map each item's id to its position in the list (first occurrence wins)"""
+    positions = {}
+    for pos, item in enumerate(items):
+        positions.setdefault(item.get("id"), pos)
+    return positions
+
+def _group_by(items: List[dict], key: str) -> Dict[Any, List[dict]]:
+    """Group items by the value of one field, keeping list order"""
+    groups = {}
+    for item in items:
+        groups.setdefault(item.get(key), []).append(item)
+    return groups
+
+def _positions_by(items: List[dict], key: str) -> Dict[Any, List[int]]:
+    """Map each value of one field to the positions of the items having it"""
+    positions = {}
+    for pos, item in enumerate(items):
+        positions.setdefault(item.get(key), []).append(pos)
+    return positions
+
+def _by_rating(products: List[dict]) -> List[dict]:
+    """Products ordered by rating, highest first (ties keep list order)"""
+    return sorted(products, key=_rating, reverse=True)
+
+def _add_count(counts: Dict[Any, int], key: Any, delta: int) -> None:
+    """Add to a count, dropping it again if a removal brings it to zero"""
+    total = counts.get(key, 0) + delta
+    if delta < 0 and not total:
+        counts.pop(key, None)
+    else:
+        counts[key] = total
+
+def _apply_sale(rollup: Dict[str, Any], sale: dict, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) one sale's figures in a rollup"""
+    rollup["total_sales"] += sign
+    rollup["total_revenue"] += sign * sale.get("total", 0)
+    _add_count(rollup["status_counts"], sale.get("payment_status"), sign)
+    for item in sale.get("items", []):
+        _add_count(rollup["variant_qty"], item.get("variant_id"), sign * item.get("qty", 0))
+
+def _sales_rollup(sales: List[dict]) -> Dict[str, Any]:
+    """Sale count, revenue, count per payment status and quantity sold per
+    variant id, aggregated in one pass over the sales"""
+    rollup = {"total_sales": 0, "total_revenue": 0, "status_counts": {}, "variant_qty": {}}
+    for sale in sales:
+        _apply_sale(rollup, sale, 1)
+    return rollup
+
+def _patch_sales_rollup(rollup: Dict[str, Any], old: Optional[dict], new: Optional[dict]) -> None:
+    """Update a rollup for one sale replaced (old -> new) or added (old=None)"""
+    if old is not None:
+        _apply_sale(rollup, old, -1)
+    if new is not None:
+        _apply_sale(rollup, new, 1)
+
+def _search_blobs(products: List[dict]) -> List[str]:
+    """Lowercased name/brand/category/description per product, parallel to the list.
+
+    Fields are joined with NUL so a query can't match across two fields.
+    """
+    return [
+        "\0".join((p.get(field) or "").lower() for field in ("name", "brand", "category", "description"))
+        for p in products
+    ]
+
+# Index name -> builder over the parsed database
+_INDEX_BUILDERS = {
+    "products_by_id": lambda db: _positions_by_id(db.get("products", [])),
+    "products_search_blob": lambda db: _search_blobs(db.get("products", [])),
+    "products_by_category": lambda db: _positions_by(db.get("products", []), "category"),
+    "products_by_rating": lambda db: _by_rating(db.get("products", [])),
+    "products_by_category_rating": lambda db: _group_by(_by_rating(db.get("products", [])), "category"),
+    "sales_by_id": lambda db: _positions_by_id(db.get("sales", [])),
+    "sales_by_customer": lambda db: _group_by(db.get("sales", []), "customer_id"),
+    "sales_by_status": lambda db: _group_by(db.get("sales", []), "payment_status"),
+    "sales_rollup": lambda db: _sales_rollup(db.get("sales", [])),
+    "vendors_by_id": lambda db: _positions_by_id(db.get("vendors", [])),
+    "vendors_name_lower": lambda db: [v.get("name", "").lower() for v in db.get("vendors", [])],
+}
+
+# Indexes that can be patched for a single-record change, as
+# patch(index, old_record, new_record), instead of rebuilt after a save
+_INDEX_PATCHERS = {
+    "sales_rollup": _patch_sales_rollup,
+}
+
+def _file_signature(filepath: str) -> Optional[tuple]:
+    """(mtime_ns, size) of a file, or None if it doesn't exist"""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def _read_json(filepath: str) -> dict:
+    """Read and parse a JSON database from disk"""
     if os.path.exists(filepath):
         try:
-            with open(filepath, 'r') as f:
-                content = f.read().strip()
-                if content:
-                    return json.loads(content)
-        except (json.JSONDecodeError, Exception) as e:
-            print(f"Warning: Error loading {filepath}: {e}")
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+            # Both parsers skip surrounding whitespace; strip only to spot an empty file
+            if raw.strip():
+                return orjson.loads(raw) if orjson else json.loads(raw)
+        except (ValueError, OSError) as e:
+            logger.warning("Error loading %s: %s", filepath, e)
     return {"products": [], "sales": [], "vendors": []}
 
-def save_json(filepath: str, data: dict) -> bool:
-    """Save JSON database"""
+def load_json_ro(filepath: str) -> dict:
+    """Load JSON database for reading.
+
+    Returns the shared cached object, so callers must not mutate it.
+    """
+    # One lookup: the flush timer may pop the entry from another thread
+    buffered = _WRITE_BUFFER.get(filepath)
+    if buffered is not None:
+        return buffered
+    
+    signature = _file_signature(filepath)
+    cached = _JSON_CACHE.get(filepath)
+    if cached is not None and signature is not None and cached[0] == signature:
+        return cached[1]
+    
+    data = _read_json(filepath)
+    if signature is not None:
+        _JSON_CACHE[filepath] = (signature, data, {})
+    return data
+
+def _get_indexed(filepath: str, key: str) -> Any:
+    """Get a named index over a database, building it on first use.
+
+    Indexes hold positions in, or references to, the records of the
+    cached data returned by load_json_ro().
+    """
+    data = load_json_ro(filepath)
+    cached = _JSON_CACHE.get(filepath)
+    if cached is None or cached[1] is not data:
+        return _INDEX_BUILDERS[key](data)
+    
+    indexes = cached[2]
+    if key not in indexes:
+        indexes[key] = _INDEX_BUILDERS[key](data)
+    return indexes[key]
+
+def _index_lookup(filepath: str, key: str, value: Any, default: Any = None) -> Any:
+    """Entry for a value in a keyed index; non-string values match nothing.
+
+    Lookup values often come straight from LLM-extracted entities, which
+    may be lists or dicts and so cannot be used as dict keys.
+    """
+    if not isinstance(value, str):
+        return default
+    return _get_indexed(filepath, key).get(value, default)
+
+# Saves deferred by buffer_writes(): path -> latest data. They are written
+# by a background timer shortly after the last buffered block exits, so a
+# burst of turns that change the same file writes it once.
+_WRITE_BUFFER: Dict[str, dict] = {}
+_buffer_depth = 0
+_FLUSH_DELAY = 0.2  # seconds
+_FLUSH_RETRY_DELAY = 5.0  # seconds, after a failed flush
+_flush_timer: Optional[threading.Timer] = None
+# Serializes database saves and the background flush
+_write_lock = threading.RLock()
+
+def _write_json(filepath: str, data: dict, from_buffer: bool = False) -> bool:
+    """Write a JSON database to disk.
+
+    Writes to a temporary file and renames it over the target, so a crash
+    mid-write never leaves a truncated database behind. With from_buffer
+    (a flush of buffered data), indexes already cached for this same data
+    object are kept, and a failed write leaves the cache entry in place
+    so the data is retried rather than dropped.
+    """
+    tmp_path = filepath + ".tmp"
     try:
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        if orjson:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, indent=2).encode("utf-8")
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, filepath)
+        cached = _JSON_CACHE.get(filepath)
+        indexes = cached[2] if from_buffer and cached is not None and cached[1] is data else {}
+        _JSON_CACHE[filepath] = (_file_signature(filepath), data, indexes)
         return True
     except Exception as e:
-        print(f"Error saving {filepath}: {e}")
+        logger.warning("Error saving %s: %s", filepath, e)
+        if not from_buffer:
+            # The cached data may hold changes that never reached disk
+            _JSON_CACHE.pop(filepath, None)
         return False
 
+def save_json(filepath: str, data: dict) -> bool:
+    """Save JSON database.
+
+    Outside buffer_writes() the data is written immediately and the return
+    value says whether the write succeeded. Inside buffer_writes() the data
+    is only queued: it is held in memory (and served to readers) until the
+    background flush writes it, so True means "queued", not "on disk". A
+    failed flush is logged and retried by flush_writes() rather than
+    reported to the caller.
+    """
+    with _write_lock:
+        if _buffer_depth:
+            _WRITE_BUFFER[filepath] = data
+            _JSON_CACHE[filepath] = (_file_signature(filepath), data, {})
+            return True
+        # Supersedes any older buffered version of this file
+        _WRITE_BUFFER.pop(filepath, None)
+        return _write_json(filepath, data)
+
+def _save_record_change(filepath: str, base: dict, db: dict,
+                        old: Optional[dict], new: Optional[dict]) -> bool:
+    """Save a database that differs from `base` by one record.
+
+    Indexes built over `base` that have a patcher are updated for the
+    change and carried over to the saved version, rather than rebuilt
+    from a full scan on next use.
+    """
+    with _write_lock:
+        cached = _JSON_CACHE.get(filepath)
+        carried = {}
+        if cached is not None and cached[1] is base:
+            carried = {key: index for key, index in cached[2].items() if key in _INDEX_PATCHERS}
+        
+        if not save_json(filepath, db):
+            return False
+        
+        saved = _JSON_CACHE.get(filepath)
+        if saved is not None and saved[1] is db:
+            for key, index in carried.items():
+                _INDEX_PATCHERS[key](index, old, new)
+                saved[2][key] = index
+        return True
+
+def _append_record(filepath: str, collection: str, record: dict) -> bool:
+    """Append a record to a database and save it.
+
+    The cached data is extended in place instead of copying the whole
+    database first; a failed save drops the cache entry so the next read
+    reloads what is on disk.
+    """
+    with _write_lock:
+        db = load_json_ro(filepath)
+        db.setdefault(collection, []).append(record)
+        return _save_record_change(filepath, db, db, None, record)
+
+def _update_record(filepath: str, collection: str, pos: int, updates: dict) -> bool:
+    """Apply updates to the record at a position and save the database.
+
+    Only the changed record and its list are copied; the cached data is
+    left as it was until the save succeeds.
+    """
+    base = load_json_ro(filepath)
+    old = base[collection][pos]
+    new = {**old, **updates}
+    db = dict(base)
+    db[collection] = list(base[collection])
+    db[collection][pos] = new
+    return _save_record_change(filepath, base, db, old, new)
+
+def flush_writes() -> bool:
+    """Write every buffered database to disk now.
+
+    Databases that fail to write stay buffered (and keep being served to
+    readers), and another flush is scheduled to retry them.
+    """
+    global _flush_timer
+    with _write_lock:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+        failed = {}
+        while _WRITE_BUFFER:
+            filepath, data = _WRITE_BUFFER.popitem()
+            if not _write_json(filepath, data, from_buffer=True):
+                failed[filepath] = data
+        if failed:
+            _WRITE_BUFFER.update(failed)
+            _schedule_flush(_FLUSH_RETRY_DELAY)
+        return not failed
+
+def _schedule_flush(delay: float = _FLUSH_DELAY) -> None:
+    """(Re)start the timer that flushes buffered writes, debouncing bursts"""
+    global _flush_timer
+    with _write_lock:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+        _flush_timer = threading.Timer(delay, flush_writes)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+# Don't lose buffered writes still waiting on the timer at exit
+atexit.register(flush_writes)
+
+@contextmanager
+def buffer_writes():
+    """Coalesce save_json() calls: each file touched inside the block is
+    written once, with its latest data, _FLUSH_DELAY after the outermost
+    block exits (unless another block starts meanwhile and extends it).
+    """
+    global _buffer_depth
+    with _write_lock:
+        _buffer_depth += 1
+    try:
+        yield
+    finally:
+        with _write_lock:
+            _buffer_depth -= 1
+            if not _buffer_depth and _WRITE_BUFFER:
+                _schedule_flush()
+
+def _top_n(items, limit: Optional[int], key) -> list:
+    """The `limit` largest items by key, ordered like sorted(..., reverse=True)[:limit]"""
+    if limit is None:
+        return sorted(items, key=key, reverse=True)
+    return heapq.nlargest(limit, items, key=key)
+
+def _rating(product: dict) -> float:
+    """Sort key for products by rating"""
+    return product.get("rating", 0)
+
+def _is_positive(value: Any) -> bool:
+    """True for a set, non-zero, positive amount"""
+    return bool(value) and value > 0
+
+# Validation schemas: field -> (check, error message) rules, applied in order
+# to the field's value; each failing check adds its message
+_PRODUCT_SCHEMA = {
+    "id": ((bool, "Product ID is required"),),
+    "name": ((bool, "Product name is required"),),
+    "category": (
+        (bool, "Category is required"),
+        (_is_valid_category, f"Category must be one of: {VALID_CATEGORIES_LIST_STR}"),
+    ),
+}
+_SALE_SCHEMA = {
+    "id": ((bool, "Sale ID is required"),),
+    "customer_id": ((bool, "Customer ID is required"),),
+    "total": ((_is_positive, "Total amount must be greater than 0"),),
+    "payment_status": (
+        (_is_valid_status, f"Payment status must be one of: {VALID_STATUSES_LIST_STR}"),
+    ),
+}
+
+def _validate_record(record: dict, schema: Dict[str, tuple]) -> List[str]:
+    """Messages for every schema rule the record fails, in schema order"""
+    return [
+        message
+        for field_name, rules in schema.items()
+        for check, message in rules
+        if not check(record.get(field_name))
+    ]
+
+def _category_lookup(index_name: str, category: Any) -> list:
+    """Entry for a category in a per-category product index"""
+    return _index_lookup(PRODUCTS_DB, index_name, category, [])
+
 # Enhanced Tool functions
 class ProductTools:
     """Enhanced product tools with fuzzy matching"""
@@ -158,20 +630,21 @@ class ProductTools:
                        max_price: Optional[float] = None,
                        min_rating: Optional[float] = None) -> List[dict]:
         """Enhanced search with flexible matching"""
-        db = load_json(PRODUCTS_DB)
+        products = load_json_ro(PRODUCTS_DB).get("products", [])
+        blobs = _get_indexed(PRODUCTS_DB, "products_search_blob")
         results = []
         query_lower = query.lower() if query else ""
         
-        for product in db.get("products", []):
-            # Fuzzy matching
-            name_match = query_lower in product.get("name", "").lower()
-            brand_match = query_lower in product.get("brand", "").lower()
-            category_match = query_lower in product.get("category", "").lower()
-            desc_match = query_lower in product.get("description", "").lower()
-            
-            if name_match or brand_match or category_match or desc_match:
-                if category and product.get("category") != category:
-                    continue
+        # Only scan the requested category's products
+        if category:
+            positions = _category_lookup("products_by_category", category)
+        else:
+            positions = range(len(products))
+        
+        for pos in positions:
+            # Fuzzy matching on name, brand, category or description
+            if query_lower in blobs[pos]:
+                product = products[pos]
                 
                 # Apply filters
                 if min_rating and product.get("rating", 0) < min_rating:
@@ -184,38 +657,25 @@ class ProductTools:
     @staticmethod
     def get_product_by_id(product_id: str) -> dict:
         """Get product with validation"""
-        db = load_json(PRODUCTS_DB)
-        for product in db.get("products", []):
-            if product.get("id") == product_id:
-                return product
-        return {}
+        pos = _index_lookup(PRODUCTS_DB, "products_by_id", product_id)
+        if pos is None:
+            return {}
+        return load_json_ro(PRODUCTS_DB)["products"][pos]
     
     @staticmethod
     def list_products_by_category(category: str) -> List[dict]:
         """List products with category validation"""
-        valid_categories = ["Electronics", "Grocery", "Fashion", "Home", "Sports"]
-        if category not in valid_categories:
+        if not _is_valid_category(category):
             return []
         
-        db = load_json(PRODUCTS_DB)
-        return [p for p in db.get("products", []) if p.get("category") == category]
+        products = load_json_ro(PRODUCTS_DB).get("products", [])
+        positions = _category_lookup("products_by_category", category)
+        return [products[pos] for pos in positions]
     
     @staticmethod
     def validate_product_data(product_data: dict) -> tuple[bool, List[str]]:
         """Validate product data before creation"""
-        errors = []
-        
-        if not product_data.get("id"):
-            errors.append("Product ID is required")
-        if not product_data.get("name"):
-            errors.append("Product name is required")
-        if not product_data.get("category"):
-            errors.append("Category is required")
-        
-        valid_categories = ["Electronics", "Grocery", "Fashion", "Home", "Sports"]
-        if product_data.get("category") not in valid_categories:
-            errors.append(f"Category must be one of: {', '.join(valid_categories)}")
-        
+        errors = _validate_record(product_data, _PRODUCT_SCHEMA)
         return len(errors) == 0, errors
     
     @staticmethod
@@ -226,40 +686,32 @@ class ProductTools:
         if not is_valid:
             return False, "Validation failed", errors
         
-        db = load_json(PRODUCTS_DB)
-        
         # Check duplicates
-        if any(p.get("id") == product_data.get("id") for p in db.get("products", [])):
+        if _index_lookup(PRODUCTS_DB, "products_by_id", product_data.get("id")) is not None:
             return False, "Product ID already exists", ["Duplicate ID"]
         
-        db.setdefault("products", []).append(product_data)
-        success = save_json(PRODUCTS_DB, db)
+        success = _append_record(PRODUCTS_DB, "products", product_data)
         
         return success, "Product created successfully" if success else "Failed to save", []
     
     @staticmethod
     def update_product(product_id: str, updates: dict) -> tuple[bool, str]:
         """Update product with validation"""
-        db = load_json(PRODUCTS_DB)
+        pos = _index_lookup(PRODUCTS_DB, "products_by_id", product_id)
+        if pos is None:
+            return False, "Product not found"
         
-        for product in db.get("products", []):
-            if product.get("id") == product_id:
-                product.update(updates)
-                success = save_json(PRODUCTS_DB, db)
-                return success, "Product updated successfully" if success else "Failed to update"
-        
-        return False, "Product not found"
+        success = _update_record(PRODUCTS_DB, "products", pos, updates)
+        return success, "Product updated successfully" if success else "Failed to update"
     
     @staticmethod
     def get_top_rated_products(limit: int = 5, category: Optional[str] = None) -> List[dict]:
         """Get top rated products"""
-        db = load_json(PRODUCTS_DB)
-        products = db.get("products", [])
-        
         if category:
-            products = [p for p in products if p.get("category") == category]
-        
-        return sorted(products, key=lambda p: p.get("rating", 0), reverse=True)[:limit]
+            ranked = _category_lookup("products_by_category_rating", category)
+        else:
+            ranked = _get_indexed(PRODUCTS_DB, "products_by_rating")
+        return ranked[:limit]
 
 class SalesTools:
     """Enhanced sales tools"""
@@ -270,43 +722,28 @@ class SalesTools:
                     date_from: Optional[str] = None,
                     date_to: Optional[str] = None) -> List[dict]:
         """Enhanced sales search"""
-        db = load_json(SALES_DB)
-        results = []
-        
-        for sale in db.get("sales", []):
-            if customer_id and sale.get("customer_id") != customer_id:
-                continue
-            if status and sale.get("payment_status") != status:
-                continue
-            results.append(sale)
-        
-        return results
+        # Start from the narrowest index and filter the rest
+        if customer_id:
+            sales = _index_lookup(SALES_DB, "sales_by_customer", customer_id, [])
+            if status:
+                return [s for s in sales if s.get("payment_status") == status]
+            return list(sales)
+        if status:
+            return list(_index_lookup(SALES_DB, "sales_by_status", status, []))
+        return list(load_json_ro(SALES_DB).get("sales", []))
     
     @staticmethod
     def get_sale_by_id(sale_id: str) -> dict:
         """Get sale details"""
-        db = load_json(SALES_DB)
-        for sale in db.get("sales", []):
-            if sale.get("id") == sale_id:
-                return sale
-        return {}
+        pos = _index_lookup(SALES_DB, "sales_by_id", sale_id)
+        if pos is None:
+            return {}
+        return load_json_ro(SALES_DB)["sales"][pos]
     
     @staticmethod
     def validate_sale_data(sale_data: dict) -> tuple[bool, List[str]]:
         """Validate sale data"""
-        errors = []
-        
-        if not sale_data.get("id"):
-            errors.append("Sale ID is required")
-        if not sale_data.get("customer_id"):
-            errors.append("Customer ID is required")
-        if not sale_data.get("total") or sale_data.get("total") <= 0:
-            errors.append("Total amount must be greater than 0")
-        
-        valid_statuses = ["PAID", "PENDING", "CANCELLED"]
-        if sale_data.get("payment_status") not in valid_statuses:
-            errors.append(f"Payment status must be one of: {', '.join(valid_statuses)}")
-        
+        errors = _validate_record(sale_data, _SALE_SCHEMA)
         return len(errors) == 0, errors
     
     @staticmethod
@@ -316,66 +753,36 @@ class SalesTools:
         if not is_valid:
             return False, "Validation failed", errors
         
-        db = load_json(SALES_DB)
-        
         # Add timestamp
         sale_data["created_at"] = datetime.now().isoformat()
         
-        db.setdefault("sales", []).append(sale_data)
-        success = save_json(SALES_DB, db)
+        success = _append_record(SALES_DB, "sales", sale_data)
         
         return success, "Sale created successfully" if success else "Failed to save", []
     
     @staticmethod
     def update_sale(sale_id: str, updates: dict) -> tuple[bool, str]:
         """Update sale"""
-        db = load_json(SALES_DB)
-        
-        for sale in db.get("sales", []):
-            if sale.get("id") == sale_id:
-                sale.update(updates)
-                success = save_json(SALES_DB, db)
-                return success, "Sale updated successfully" if success else "Failed to update"
+        pos = _index_lookup(SALES_DB, "sales_by_id", sale_id)
+        if pos is None:
+            return False, "Sale not found"
         
-        return False, "Sale not found"
+        success = _update_record(SALES_DB, "sales", pos, updates)
+        return success, "Sale updated successfully" if success else "Failed to update"
 
 class AnalyticsTools:
     """Enhanced analytics tools"""
     
     @staticmethod
-    def get_top_products(limit: int = 5) -> List[Dict[str, Any]]:
-        """Get top selling products with details"""
-        db_sales = load_json(SALES_DB)
-        db_products = load_json(PRODUCTS_DB)
-        
-        product_sales = {}
-        for sale in db_sales.get("sales", []):
-            for item in sale.get("items", []):
-                variant_id = item.get("variant_id")
-                qty = item.get("qty", 0)
-                product_sales[variant_id] = product_sales.get(variant_id, 0) + qty
-        
-        sorted_products = sorted(product_sales.items(), key=lambda x: x[1], reverse=True)
-        
-        # Get product details
-        result = []
-        for variant_id, qty in sorted_products[:limit]:
-            result.append({"variant_id": variant_id, "quantity_sold": qty})
-        
-        return result
-    
-    @staticmethod
-    def get_sales_summary() -> dict:
-        """Comprehensive sales summary"""
-        db = load_json(SALES_DB)
-        sales = db.get("sales", [])
-        
-        total_sales = len(sales)
-        total_revenue = sum(s.get("total", 0) for s in sales)
-        paid_sales = len([s for s in sales if s.get("payment_status") == "PAID"])
-        pending_sales = len([s for s in sales if s.get("payment_status") == "PENDING"])
-        
-        return {
+    def get_analytics_bundle(top_n: int = 5) -> Dict[str, Any]:
+        """Sales summary and top selling products from one aggregation pass"""
+        rollup = _get_indexed(SALES_DB, "sales_rollup")
+        
+        total_sales = rollup["total_sales"]
+        total_revenue = rollup["total_revenue"]
+        paid_sales = rollup["status_counts"].get("PAID", 0)
+        pending_sales = rollup["status_counts"].get("PENDING", 0)
+        summary = {
             "total_sales": total_sales,
             "total_revenue": total_revenue,
             "paid_sales": paid_sales,
@@ -384,23 +791,36 @@ class AnalyticsTools:
             "average_transaction": total_revenue / total_sales if total_sales > 0 else 0,
             "payment_completion_rate": (paid_sales / total_sales * 100) if total_sales > 0 else 0
         }
+        
+        top = _top_n(rollup["variant_qty"].items(), top_n, key=lambda x: x[1])
+        top_products = [{"variant_id": variant_id, "quantity_sold": qty} for variant_id, qty in top]
+        
+        return {"summary": summary, "top_products": top_products}
+    
+    @staticmethod
+    def get_top_products(limit: int = 5) -> List[Dict[str, Any]]:
+        """Get top selling products with details"""
+        return AnalyticsTools.get_analytics_bundle(limit)["top_products"]
+    
+    @staticmethod
+    def get_sales_summary() -> dict:
+        """Comprehensive sales summary"""
+        return AnalyticsTools.get_analytics_bundle(0)["summary"]
     
     @staticmethod
     def recommend_products(category: Optional[str] = None, 
                           based_on: str = "rating",
                           limit: int = 5) -> List[dict]:
         """Enhanced product recommendations"""
-        db = load_json(PRODUCTS_DB)
-        products = db.get("products", [])
-        
-        if category:
-            products = [p for p in products if p.get("category") == category]
-        
         if based_on == "rating":
-            return sorted(products, key=lambda p: p.get("rating", 0), reverse=True)[:limit]
+            return ProductTools.get_top_rated_products(limit, category)
         elif based_on == "sales":
             return AnalyticsTools.get_top_products(limit)
         
+        products = load_json_ro(PRODUCTS_DB).get("products", [])
+        if category:
+            positions = _category_lookup("products_by_category", category)
+            return [products[pos] for pos in positions[:limit]]
         return products[:limit]
 
 class VendorTools:
@@ -409,44 +829,186 @@ class VendorTools:
     @staticmethod
     def list_vendors() -> List[dict]:
         """List all vendors"""
-        db = load_json(VENDORS_DB)
+        db = load_json_ro(VENDORS_DB)
         return db.get("vendors", [])
     
     @staticmethod
     def get_vendor_by_id(vendor_id: str) -> dict:
         """Get vendor details"""
-        db = load_json(VENDORS_DB)
-        for vendor in db.get("vendors", []):
-            if vendor.get("id") == vendor_id:
-                return vendor
-        return {}
+        pos = _index_lookup(VENDORS_DB, "vendors_by_id", vendor_id)
+        if pos is None:
+            return {}
+        return load_json_ro(VENDORS_DB)["vendors"][pos]
     
     @staticmethod
     def search_vendors(query: str) -> List[dict]:
         """Search vendors by name"""
-        db = load_json(VENDORS_DB)
+        vendors = load_json_ro(VENDORS_DB).get("vendors", [])
+        names = _get_indexed(VENDORS_DB, "vendors_name_lower")
         query_lower = query.lower()
-        return [v for v in db.get("vendors", []) 
-                if query_lower in v.get("name", "").lower()]
+        return [v for v, name in zip(vendors, names) if query_lower in name]
+
+# Yes/no replies to a pending action, matched as whole words so that
+# "yesterday" or "know" don't count
+_CONFIRM_RE = re.compile(r"\b(yes|y|confirm|ok|okay|proceed|sure|go\s*ahead)\b", re.I)
+_CANCEL_RE = re.compile(r"\b(no|n|cancel|abort|stop|nevermind)\b", re.I)
+
+# Intent -> graph node that handles it; anything else goes to general_agent
+_INTENT_ROUTES = {
+    "search_product": "product_agent",
+    "get_product_details": "product_agent",
+    "create_product": "product_agent",
+    "update_product": "product_agent",
+    "search_sales": "sales_agent",
+    "create_sale": "sales_agent",
+    "update_sale": "sales_agent",
+    "get_analytics": "analytics_agent",
+    "get_recommendations": "analytics_agent",
+    "vendor_query": "vendor_agent",
+    "confirm_action": "execute_confirmation",
+    "cancel_action": "handle_cancellation",
+}
+
+# Keyword -> intent for the offline fallback. Insertion order is the priority
+# used when a message hits several intents.
+_FALLBACK_KEYWORDS = {
+    "search": "search_product",
+    "find": "search_product",
+    "show": "search_product",
+    "look": "search_product",
+    "product": "search_product",
+    "sale": "search_sales",
+    "order": "search_sales",
+    "purchase": "search_sales",
+    "transaction": "search_sales",
+    "recommend": "get_recommendations",
+    "suggest": "get_recommendations",
+    "best": "get_recommendations",
+    "top": "get_recommendations",
+    "analytics": "get_analytics",
+    "report": "get_analytics",
+    "summary": "get_analytics",
+    "stats": "get_analytics",
+    "vendor": "vendor_query",
+    "supplier": "vendor_query",
+    "create": "create",
+    "add": "create",
+}
+_FALLBACK_PRIORITY = {
+    intent: rank for rank, intent in enumerate(dict.fromkeys(_FALLBACK_KEYWORDS.values()))
+}
+# Keywords matched at a word start, so "recommendations", "searching" and
+# "shoes" still count; one alternation scans the message once
+_FALLBACK_RE = re.compile(r"\b(?:" + "|".join(
+    re.escape(k) for k in sorted(_FALLBACK_KEYWORDS, key=len, reverse=True)
+) + ")")
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Outermost {...} in an LLM reply, ignoring code fences or prose around it
+_JSON_BLOCK_RE = re.compile(r"\{.*\}", re.S)
+# The "intent" field, which the model emits first while streaming
+_INTENT_FIELD_RE = re.compile(r'"intent"\s*:\s*"([a-z_]+)"')
+
+# Databases and indexes each intent's agent will read. Loading them while
+# the rest of the NLU reply streams in hides the read behind generation.
+_INTENT_PREFETCH = {
+    "search_product": [(PRODUCTS_DB, "products_search_blob")],
+    "get_product_details": [(PRODUCTS_DB, "products_by_id")],
+    "create_product": [(PRODUCTS_DB, "products_by_id")],
+    "update_product": [(PRODUCTS_DB, "products_by_id")],
+    "search_sales": [(SALES_DB, "sales_by_customer"), (SALES_DB, "sales_by_status")],
+    "create_sale": [(SALES_DB, None)],
+    "update_sale": [(SALES_DB, "sales_by_id")],
+    "get_analytics": [(SALES_DB, "sales_rollup")],
+    "get_recommendations": [(PRODUCTS_DB, None)],
+    "vendor_query": [(VENDORS_DB, "vendors_by_id")],
+}
+
+def _prefetch_for_intent(intent: str) -> None:
+    """Warm the JSON cache and indexes the given intent's agent will use"""
+    for filepath, key in _INTENT_PREFETCH.get(intent, ()):
+        if key is None:
+            load_json_ro(filepath)
+        else:
+            _get_indexed(filepath, key)
+
+# Exact-match LRU of parsed NLU results. Keys combine the normalized message
+# with the NLU context shown to the model, so a hit skips the LLM.
+_NLU_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_NLU_CACHE_SIZE = 256
+
+# Exact-match LRU of general-chat replies, keyed by the message together
+# with the context the chat prompt shows, minus the per-turn message count
+# so repeated small talk still hits.
+_CHAT_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_CHAT_CACHE_SIZE = 512
+
+# Small talk answered without the LLM: bare greetings and acknowledgements
+_GREETINGS = frozenset({
+    "hi", "hii", "hello", "hey", "hi there", "hello there", "hey there",
+    "good morning", "good afternoon", "good evening"
+})
+_ACKNOWLEDGEMENT_RE = re.compile(
+    r"(?:thanks|thank you|thx|ok|okay|cool|nice|great|got it|awesome)(?: (?:so much|a lot))?"
+)
+_GREETING_REPLY = (
+    "Hello! 👋 I can help you search products, check sales, get analytics "
+    "and recommendations, or manage vendors. What would you like to do?"
+)
+_ACKNOWLEDGEMENT_REPLY = "You're welcome! Is there anything else I can help you with?"
+
+def _canned_reply(user_input: str) -> Optional[str]:
+    """Fixed reply for a bare greeting or acknowledgement, else None"""
+    text = " ".join(user_input.lower().split()).strip(" !.,?")
+    if text in _GREETINGS:
+        return _GREETING_REPLY
+    if _ACKNOWLEDGEMENT_RE.fullmatch(text):
+        return _ACKNOWLEDGEMENT_REPLY
+    return None
+
+# General chat goes to the small model when the message is short and has no
+# sales vocabulary; anything else gets the 70B model
+_CHAT_MODEL = "llama-3.3-70b-versatile"
+_SMALL_CHAT_MODEL = "llama-3.1-8b-instant"
+_SMALL_CHAT_MAX_WORDS = 15
+_SMALL_CHAT_MAX_TOKENS = 150
+
+def _chat_model_options(user_input: str) -> Dict[str, Any]:
+    """Model and token limit for a general-chat reply to this message"""
+    lower_input = user_input.lower()
+    if len(_WORD_RE.findall(lower_input)) < _SMALL_CHAT_MAX_WORDS and not _FALLBACK_RE.search(lower_input):
+        return {"model": _SMALL_CHAT_MODEL, "max_tokens": _SMALL_CHAT_MAX_TOKENS}
+    return {"model": _CHAT_MODEL}
+
+def _message_cache_key(user_input: str, context: str) -> str:
+    """Cache key for a message in the given serialized context"""
+    raw = " ".join(user_input.lower().split()) + "|" + context
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
 
 # Enhanced NLU for intent and entity extraction
 class NaturalLanguageUnderstanding:
     """Extract intent and entities from user input"""
     
     @staticmethod
-    def extract_intent_and_entities(user_input: str, session_memory: SessionMemory) -> Dict[str, Any]:
+    async def extract_intent_and_entities(user_input: str, session_memory: SessionMemory) -> Dict[str, Any]:
         """Use LLM to extract intent and entities"""
+        nlu_context = _compact_json(session_memory.get_nlu_context())
+        cache_key = _message_cache_key(user_input, nlu_context)
+        cached = _NLU_CACHE.get(cache_key)
+        if cached is not None:
+            _NLU_CACHE.move_to_end(cache_key)
+            return copy.deepcopy(cached)
         
         system_prompt = f"""You are an intent classifier for a sales chatbot. Analyze the user's message and extract:
 1. Intent (one of: search_product, get_product_details, create_product, update_product, search_sales, 
    create_sale, update_sale, get_analytics, get_recommendations, vendor_query, general_chat)
 2. Entities (product names, categories, IDs, prices, dates, customer IDs, statuses)
 
-Valid categories: Electronics, Grocery, Fashion, Home, Sports
-Valid payment statuses: PAID, PENDING, CANCELLED
+Valid categories: {VALID_CATEGORIES_LIST_STR}
+Valid payment statuses: {VALID_STATUSES_LIST_STR}
 
 Current conversation context:
-{session_memory.get_context_string()}
+{nlu_context}
 
 User message: {user_input}
 
@@ -469,56 +1031,74 @@ Respond ONLY with a JSON object in this format:
   "clarification_needed": []
 }}"""
 
+        prefetch = None
         try:
-            completion = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[{"role": "user", "content": system_prompt}],
-                temperature=0.1,
-                
-            )
-            
-            response = completion.choices[0].message.content
+            # Stream the reply so the agent's data can be loaded as soon as
+            # the intent is known, while the entities are still generating
+            parts = []
+            async with _LLM_SEMAPHORE:
+                stream = await aclient.chat.completions.create(
+                    model="llama-3.3-70b-versatile",
+                    messages=[{"role": "user", "content": system_prompt}],
+                    temperature=0.1,
+                    stream=True
+                )
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    parts.append(delta)
+                    if prefetch is None:
+                        intent_match = _INTENT_FIELD_RE.search("".join(parts))
+                        if intent_match:
+                            prefetch = asyncio.create_task(
+                                asyncio.to_thread(_prefetch_for_intent, intent_match.group(1))
+                            )
             
-            # Clean response
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response[:-3]
-            response = response.strip()
+            response = "".join(parts)
             
-            result = json.loads(response)
-            return result
+            match = _JSON_BLOCK_RE.search(response)
+            if not match:
+                raise ValueError("No JSON object in NLU response")
+            block = match.group(0)
+            result = orjson.loads(block) if orjson else json.loads(block)
         
         except Exception as e:
-            print(f"NLU Error: {e}")
+            if prefetch is not None:
+                prefetch.cancel()
+            logger.warning("NLU error, using keyword fallback: %s", e)
             # Fallback to basic keyword matching
             return NaturalLanguageUnderstanding._fallback_intent_detection(user_input)
+        
+        # Warming the cache is only an optimization; the agent loads the
+        # data itself if it failed, so keep the parsed intent either way
+        if prefetch is not None:
+            try:
+                await prefetch
+            except Exception as e:
+                logger.warning("NLU prefetch failed: %s", e)
+        
+        _NLU_CACHE[cache_key] = copy.deepcopy(result)
+        if len(_NLU_CACHE) > _NLU_CACHE_SIZE:
+            _NLU_CACHE.popitem(last=False)
+        return result
     
     @staticmethod
     def _fallback_intent_detection(user_input: str) -> Dict[str, Any]:
         """Fallback intent detection"""
-        user_lower = user_input.lower()
+        keywords = set(_FALLBACK_RE.findall(user_input.lower()))
         
         intent = "general_chat"
         entities = {}
         
-        if any(word in user_lower for word in ["search", "find", "show", "look", "product"]):
-            intent = "search_product"
-        elif any(word in user_lower for word in ["sale", "order", "purchase", "transaction"]):
-            intent = "search_sales"
-        elif any(word in user_lower for word in ["recommend", "suggest", "best", "top"]):
-            intent = "get_recommendations"
-        elif any(word in user_lower for word in ["analytics", "report", "summary", "stats"]):
-            intent = "get_analytics"
-        elif any(word in user_lower for word in ["vendor", "supplier"]):
-            intent = "vendor_query"
-        elif any(word in user_lower for word in ["create", "add"]):
-            if "product" in user_lower:
+        matched = {_FALLBACK_KEYWORDS[k] for k in keywords}
+        if matched:
+            best = min(matched, key=_FALLBACK_PRIORITY.__getitem__)
+            if best != "create":
+                intent = best
+            elif "product" in keywords:
                 intent = "create_product"
-            elif "sale" in user_lower:
+            elif "sale" in keywords:
                 intent = "create_sale"
         
         return {
@@ -529,6 +1109,108 @@ Respond ONLY with a JSON object in this format:
         }
 
 # LangGraph Nodes
+# Star strings for ratings 0-5
+_STARS = tuple("⭐" * i for i in range(6))
+
+def _stars(rating: float) -> str:
+    """Star string for a rating, clamped to 0-5 stars"""
+    return _STARS[min(5, max(0, int(rating)))]
+
+# Response templates for the formatting helpers, filled with format_map().
+# Each *_DEFAULTS dict supplies the value shown for a missing field.
+_PRODUCT_ROW_TMPL = (
+    "{idx}. **{name}**\n"
+    "   • ID: {id}\n"
+    "   • Category: {category}\n"
+    "   • Brand: {brand}\n"
+    "   • Rating: {stars}\n"
+    "   • Description: {description}\n\n"
+)
+_PRODUCT_ROW_DEFAULTS = {
+    "name": "Unknown", "id": None, "category": "N/A", "brand": "N/A",
+    "description": "No description"
+}
+_PRODUCT_DETAILS_TMPL = (
+    "📦 **Product Details**\n\n"
+    "**{name}**\n\n"
+    "• ID: {id}\n"
+    "• Category: {category}\n"
+    "• Brand: {brand}\n"
+    "• Rating: {rating}/5 {stars}\n"
+    "• Description: {description}\n"
+)
+_PRODUCT_DETAILS_DEFAULTS = {
+    "name": "Unknown", "id": None, "category": "N/A", "brand": "N/A", "rating": 0,
+    "description": "No description available"
+}
+_SALE_ROW_TMPL = (
+    "{idx}. **Sale {id}**\n"
+    "   • Customer: {customer_id}\n"
+    "   • Total: ₹{total:,.2f}\n"
+    "   • Status: {payment_status}\n"
+    "   • Date: {created_at}\n\n"
+)
+_SALE_ROW_DEFAULTS = {
+    "id": None, "customer_id": None, "total": 0, "payment_status": "UNKNOWN", "created_at": "N/A"
+}
+_VENDOR_ROW_TMPL = (
+    "{idx}. **{name}**\n"
+    "   • ID: {id}\n"
+    "   • Contact: {contact}\n\n"
+)
+_VENDOR_DETAILS_TMPL = (
+    "🏢 **Vendor Details**\n\n"
+    "**{name}**\n\n"
+    "• ID: {id}\n"
+    "• Contact: {contact}\n"
+    "• Email: {email}\n"
+    "• Phone: {phone}\n"
+)
+_VENDOR_DEFAULTS = {"name": "Unknown", "id": None, "contact": "N/A", "email": "N/A", "phone": "N/A"}
+_ANALYTICS_SUMMARY_TMPL = (
+    "📊 **Sales Analytics Summary**\n\n"
+    "• Total Sales: {total_sales}\n"
+    "• Total Revenue: ₹{total_revenue:,.2f}\n"
+    "• Paid Sales: {paid_sales}\n"
+    "• Pending Sales: {pending_sales}\n"
+    "• Average Transaction: ₹{average_transaction:,.2f}\n"
+    "• Payment Completion Rate: {payment_completion_rate:.1f}%\n\n"
+)
+_TOP_PRODUCT_ROW_TMPL = "{idx}. Variant ID: {variant_id} - Sold: {quantity_sold} units\n"
+
+# Cumulative wall time (seconds) and call count per graph node, see timed()
+_NODE_STATS: Counter = Counter()
+_NODE_CALLS: Counter = Counter()
+
+def timed(node_fn):
+    """Decorator recording a node's run time and calls in _NODE_STATS/_NODE_CALLS"""
+    name = node_fn.__name__
+    
+    if inspect.iscoroutinefunction(node_fn):
+        @wraps(node_fn)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await node_fn(*args, **kwargs)
+            finally:
+                _NODE_STATS[name] += time.perf_counter() - start
+                _NODE_CALLS[name] += 1
+        return async_wrapper
+    
+    @wraps(node_fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return node_fn(*args, **kwargs)
+        finally:
+            _NODE_STATS[name] += time.perf_counter() - start
+            _NODE_CALLS[name] += 1
+    return wrapper
+
+def get_node_stats() -> List[tuple]:
+    """(node name, total seconds, calls) for each timed node, slowest first"""
+    return [(name, total, _NODE_CALLS[name]) for name, total in _NODE_STATS.most_common()]
+
 class ChatbotNodes:
     """Node functions for LangGraph"""
     
@@ -540,24 +1222,31 @@ class ChatbotNodes:
         self.analytics_tools = AnalyticsTools()
         self.vendor_tools = VendorTools()
     
-    def understand_input(self, state: ConversationState) -> ConversationState:
+    @timed
+    async def understand_input(self, state: ConversationState) -> ConversationState:
         """Node: Extract intent and entities"""
         user_input = state["user_input"]
         
         # Check for confirmation keywords
-        if any(word in user_input.lower() for word in ["yes", "confirm", "ok", "proceed", "sure"]):
+        if _CONFIRM_RE.search(user_input):
             pending = self.session_memory.get_pending_action()
             if pending:
                 state["intent"] = "confirm_action"
                 state["entities"] = pending
                 return state
         
-        if any(word in user_input.lower() for word in ["no", "cancel", "abort"]):
+        if _CANCEL_RE.search(user_input):
             state["intent"] = "cancel_action"
             return state
         
+        # Bare greetings and thanks get a canned reply, so skip the NLU call
+        if _canned_reply(user_input) is not None:
+            state["intent"] = "general_chat"
+            state["entities"] = {}
+            return state
+        
         # Extract intent and entities
-        nlu_result = self.nlu.extract_intent_and_entities(user_input, self.session_memory)
+        nlu_result = await self.nlu.extract_intent_and_entities(user_input, self.session_memory)
         
         state["intent"] = nlu_result.get("intent", "general_chat")
         state["entities"] = nlu_result.get("entities", {})
@@ -565,6 +1254,7 @@ class ChatbotNodes:
         
         return state
     
+    @timed
     def validate_input(self, state: ConversationState) -> ConversationState:
         """Node: Validate extracted entities"""
         intent = state["intent"]
@@ -573,41 +1263,28 @@ class ChatbotNodes:
         
         # Category validation
         if "category" in entities and entities["category"]:
-            valid_categories = ["Electronics", "Grocery", "Fashion", "Home", "Sports"]
-            if entities["category"] not in valid_categories:
-                errors.append(f"Invalid category. Choose from: {', '.join(valid_categories)}")
+            if not _is_valid_category(entities["category"]):
+                errors.append(f"Invalid category. Choose from: {VALID_CATEGORIES_LIST_STR}")
         
         # Status validation
         if "status" in entities and entities["status"]:
-            valid_statuses = ["PAID", "PENDING", "CANCELLED"]
-            if entities["status"] not in valid_statuses:
-                errors.append(f"Invalid status. Choose from: {', '.join(valid_statuses)}")
+            if not _is_valid_status(entities["status"]):
+                errors.append(f"Invalid status. Choose from: {VALID_STATUSES_LIST_STR}")
         
         state["validation_errors"] = errors
         return state
     
     def route_to_agent(self, state: ConversationState) -> str:
         """Routing function for graph"""
-        intent = state["intent"]
-        
         if state.get("validation_errors"):
             return "handle_validation_errors"
         
-        if intent in ["search_product", "get_product_details", "create_product", "update_product"]:
-            return "product_agent"
-        elif intent in ["search_sales", "create_sale", "update_sale"]:
-            return "sales_agent"
-        elif intent in ["get_analytics", "get_recommendations"]:
-            return "analytics_agent"
-        elif intent in ["vendor_query"]:
-            return "vendor_agent"
-        elif intent in ["confirm_action"]:
-            return "execute_confirmation"
-        elif intent in ["cancel_action"]:
-            return "handle_cancellation"
-        else:
+        intent = state["intent"]
+        if not isinstance(intent, str):
             return "general_agent"
+        return _INTENT_ROUTES.get(intent, "general_agent")
     
+    @timed
     def product_agent_node(self, state: ConversationState) -> ConversationState:
         """Node: Handle product operations"""
         intent = state["intent"]
@@ -620,7 +1297,7 @@ class ChatbotNodes:
                 min_rating=entities.get("rating_min")
             )
             
-            self.session_memory.update_context("last_search_results", results)
+            self.session_memory.update_context("last_search_results", results[:MAX_CONTEXT_SEARCH_RESULTS])
             self.session_memory.update_context("last_filters", entities)
             
             if results:
@@ -634,7 +1311,7 @@ class ChatbotNodes:
             product_id = entities.get("product_id")
             if not product_id:
                 # Try to get from context
-                product_id = self.session_memory.context.get("last_product_id")
+                product_id = self.session_memory.context.last_product_id
             
             if product_id:
                 product = self.product_tools.get_product_by_id(product_id)
@@ -709,6 +1386,7 @@ class ChatbotNodes:
         
         return state
     
+    @timed
     def sales_agent_node(self, state: ConversationState) -> ConversationState:
         """Node: Handle sales operations"""
         intent = state["intent"]
@@ -766,31 +1444,29 @@ class ChatbotNodes:
         
         return state
     
-    def analytics_agent_node(self, state: ConversationState) -> ConversationState:
+    @timed
+    async def analytics_agent_node(self, state: ConversationState) -> ConversationState:
         """Node: Handle analytics queries"""
         intent = state["intent"]
         
         if intent == "get_analytics":
-            summary = self.analytics_tools.get_sales_summary()
-            top_products = self.analytics_tools.get_top_products(limit=5)
-            
-            response = "📊 **Sales Analytics Summary**\n\n"
-            response += f"• Total Sales: {summary['total_sales']}\n"
-            response += f"• Total Revenue: ₹{summary['total_revenue']:,.2f}\n"
-            response += f"• Paid Sales: {summary['paid_sales']}\n"
-            response += f"• Pending Sales: {summary['pending_sales']}\n"
-            response += f"• Average Transaction: ₹{summary['average_transaction']:,.2f}\n"
-            response += f"• Payment Completion Rate: {summary['payment_completion_rate']:.1f}%\n\n"
+            bundle = await asyncio.to_thread(self.analytics_tools.get_analytics_bundle, 5)
+            summary = bundle["summary"]
+            top_products = bundle["top_products"]
             
+            parts = [_ANALYTICS_SUMMARY_TMPL.format_map(summary)]
             if top_products:
-                response += "🔥 **Top Selling Products:**\n"
-                for idx, prod in enumerate(top_products, 1):
-                    response += f"{idx}. Variant ID: {prod['variant_id']} - Sold: {prod['quantity_sold']} units\n"
+                parts.append("🔥 **Top Selling Products:**\n")
+                parts.extend(
+                    _TOP_PRODUCT_ROW_TMPL.format_map({**prod, "idx": idx})
+                    for idx, prod in enumerate(top_products, 1)
+                )
             
-            state["agent_response"] = response
+            state["agent_response"] = "".join(parts)
         
         return state
     
+    @timed
     def vendor_agent_node(self, state: ConversationState) -> ConversationState:
         """Node: Handle vendor queries"""
         entities = state["entities"]
@@ -812,9 +1488,21 @@ class ChatbotNodes:
         state["agent_response"] = response
         return state
     
-    def general_agent_node(self, state: ConversationState) -> ConversationState:
+    @timed
+    async def general_agent_node(self, state: ConversationState) -> ConversationState:
         """Node: Handle general conversation"""
         user_input = state["user_input"]
+        canned = _canned_reply(user_input)
+        if canned is not None:
+            state["agent_response"] = canned
+            return state
+        
+        cache_key = _message_cache_key(user_input, self.session_memory.get_reply_cache_context())
+        cached = _CHAT_CACHE.get(cache_key)
+        if cached is not None:
+            _CHAT_CACHE.move_to_end(cache_key)
+            state["agent_response"] = cached
+            return state
         
         system_prompt = f"""You are a friendly sales assistant for Veract Consultancy. 
 The user said: {user_input}
@@ -829,24 +1517,41 @@ Context: {self.session_memory.get_context_string()}
 
 Keep your response conversational and under 100 words."""
 
+        sink = _token_sink.get()
+        parts = []
         try:
-            completion = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_input}
-                ],
-                temperature=0.7,
-                
-            )
+            async with _LLM_SEMAPHORE:
+                stream = await aclient.chat.completions.create(
+                    **_chat_model_options(user_input),
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_input}
+                    ],
+                    temperature=0.7,
+                    stream=True
+                )
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    parts.append(delta)
+                    if sink is not None:
+                        sink(delta)
             
-            response = completion.choices[0].message.content
+            response = "".join(parts)
             state["agent_response"] = response
+            
+            _CHAT_CACHE[cache_key] = response
+            if len(_CHAT_CACHE) > _CHAT_CACHE_SIZE:
+                _CHAT_CACHE.popitem(last=False)
         except Exception as e:
-            state["agent_response"] = "I'm here to help! You can ask me to search for products, check sales, get analytics, or manage vendors. What would you like to do?"
+            logger.warning("General chat error: %s", e)
+            # Keep whatever was already streamed to the user
+            state["agent_response"] = "".join(parts) or "I'm here to help! You can ask me to search for products, check sales, get analytics, or manage vendors. What would you like to do?"
         
         return state
     
+    @timed
     def execute_confirmation_node(self, state: ConversationState) -> ConversationState:
         """Node: Execute confirmed actions"""
         pending = self.session_memory.get_pending_action()
@@ -919,12 +1624,14 @@ Keep your response conversational and under 100 words."""
         
         return state
     
+    @timed
     def handle_cancellation_node(self, state: ConversationState) -> ConversationState:
         """Node: Handle action cancellation"""
         self.session_memory.clear_pending_actions()
         state["agent_response"] = "No problem! I've cancelled that action. What else can I help you with?"
         return state
     
+    @timed
     def handle_validation_errors_node(self, state: ConversationState) -> ConversationState:
         """Node: Handle validation errors"""
         errors = state.get("validation_errors", [])
@@ -943,32 +1650,27 @@ Keep your response conversational and under 100 words."""
         if not products:
             return "No products found."
         
-        response = f"I found {len(products)} product(s):\n\n"
+        parts = [f"I found {len(products)} product(s):\n\n"]
         for idx, product in enumerate(products[:10], 1):  # Limit to 10
-            response += f"{idx}. **{product.get('name', 'Unknown')}**\n"
-            response += f"   • ID: {product.get('id')}\n"
-            response += f"   • Category: {product.get('category', 'N/A')}\n"
-            response += f"   • Brand: {product.get('brand', 'N/A')}\n"
-            response += f"   • Rating: {'⭐' * int(product.get('rating', 0))}\n"
-            response += f"   • Description: {product.get('description', 'No description')}\n\n"
+            stars = _stars(product.get('rating', 0))
+            parts.append(_PRODUCT_ROW_TMPL.format_map(
+                {**_PRODUCT_ROW_DEFAULTS, **product, "idx": idx, "stars": stars}
+            ))
         
         if len(products) > 10:
-            response += f"...and {len(products) - 10} more products.\n"
+            parts.append(f"...and {len(products) - 10} more products.\n")
         
-        return response
+        return "".join(parts)
     
     def _format_product_details(self, product: dict) -> str:
         """Format detailed product info"""
-        response = f"📦 **Product Details**\n\n"
-        response += f"**{product.get('name', 'Unknown')}**\n\n"
-        response += f"• ID: {product.get('id')}\n"
-        response += f"• Category: {product.get('category', 'N/A')}\n"
-        response += f"• Brand: {product.get('brand', 'N/A')}\n"
-        response += f"• Rating: {product.get('rating', 0)}/5 {'⭐' * int(product.get('rating', 0))}\n"
-        response += f"• Description: {product.get('description', 'No description available')}\n"
+        stars = _stars(product.get('rating', 0))
+        response = _PRODUCT_DETAILS_TMPL.format_map(
+            {**_PRODUCT_DETAILS_DEFAULTS, **product, "stars": stars}
+        )
         
         if product.get('variants'):
-            response += f"\n**Available Variants:** {len(product['variants'])}\n"
+            response = f"{response}\n**Available Variants:** {len(product['variants'])}\n"
         
         return response
     
@@ -977,37 +1679,25 @@ Keep your response conversational and under 100 words."""
         if not sales:
             return "No sales found."
         
-        response = f"I found {len(sales)} sale(s):\n\n"
+        parts = [f"I found {len(sales)} sale(s):\n\n"]
         for idx, sale in enumerate(sales[:10], 1):
-            response += f"{idx}. **Sale {sale.get('id')}**\n"
-            response += f"   • Customer: {sale.get('customer_id')}\n"
-            response += f"   • Total: ₹{sale.get('total', 0):,.2f}\n"
-            response += f"   • Status: {sale.get('payment_status', 'UNKNOWN')}\n"
-            response += f"   • Date: {sale.get('created_at', 'N/A')}\n\n"
+            parts.append(_SALE_ROW_TMPL.format_map({**_SALE_ROW_DEFAULTS, **sale, "idx": idx}))
         
         if len(sales) > 10:
-            response += f"...and {len(sales) - 10} more sales.\n"
+            parts.append(f"...and {len(sales) - 10} more sales.\n")
         
-        return response
+        return "".join(parts)
     
     def _format_vendor_list(self, vendors: List[dict]) -> str:
         """Format vendor list"""
-        response = ""
-        for idx, vendor in enumerate(vendors, 1):
-            response += f"{idx}. **{vendor.get('name', 'Unknown')}**\n"
-            response += f"   • ID: {vendor.get('id')}\n"
-            response += f"   • Contact: {vendor.get('contact', 'N/A')}\n\n"
-        return response
+        return "".join(
+            _VENDOR_ROW_TMPL.format_map({**_VENDOR_DEFAULTS, **vendor, "idx": idx})
+            for idx, vendor in enumerate(vendors, 1)
+        )
     
     def _format_vendor_details(self, vendor: dict) -> str:
         """Format vendor details"""
-        response = f"🏢 **Vendor Details**\n\n"
-        response += f"**{vendor.get('name', 'Unknown')}**\n\n"
-        response += f"• ID: {vendor.get('id')}\n"
-        response += f"• Contact: {vendor.get('contact', 'N/A')}\n"
-        response += f"• Email: {vendor.get('email', 'N/A')}\n"
-        response += f"• Phone: {vendor.get('phone', 'N/A')}\n"
-        return response
+        return _VENDOR_DETAILS_TMPL.format_map({**_VENDOR_DEFAULTS, **vendor})
 
 # Build LangGraph
 def build_conversation_graph(session_memory: SessionMemory) -> StateGraph:
@@ -1072,8 +1762,13 @@ class EnhancedChatbot:
         self.session_memory = SessionMemory()
         self.graph = build_conversation_graph(self.session_memory)
     
-    def process_message(self, user_input: str) -> str:
-        """Process user message through graph"""
+    async def process_message(self, user_input: str,
+                              on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Process user message through graph.
+
+        If on_token is given, general-chat replies are passed to it piece
+        by piece as the LLM streams them; the full reply is still returned.
+        """
         
         # Add to memory
         self.session_memory.add_message("user", user_input)
@@ -1094,7 +1789,13 @@ class EnhancedChatbot:
         
         # Run through graph
         try:
-            result = self.graph.invoke(initial_state)
+            # Saves made during the turn hit disk once, when it finishes
+            sink_token = _token_sink.set(on_token)
+            try:
+                with buffer_writes():
+                    result = await self.graph.ainvoke(initial_state)
+            finally:
+                _token_sink.reset(sink_token)
             response = result.get("agent_response", "I'm not sure how to help with that. Could you rephrase?")
             
             # Add to memory
@@ -1104,132 +1805,36 @@ class EnhancedChatbot:
         
         except Exception as e:
             error_msg = f"I encountered an error: {str(e)}. Could you try again?"
-            print(f"Graph Error: {e}")
+            logger.warning("Graph error: %s", e)
             return error_msg
     
     def reset(self):
-        """Reset chatbot memory"""
+        """Reset chatbot memory.
+
+        The graph's nodes hold this same SessionMemory, so clearing it in
+        place is enough; the compiled graph is reused.
+        """
         self.session_memory.reset()
-        self.graph = build_conversation_graph(self.session_memory)
+
+# Seed databases shipped in samples/: (database, collection, minimum records).
+# A database with fewer records than the minimum is replaced by its sample.
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "samples")
+_SAMPLE_DATABASES = (
+    (PRODUCTS_DB, "products", 3),
+    (SALES_DB, "sales", 2),
+    (VENDORS_DB, "vendors", 1),
+)
 
 # Initialize sample data
 def initialize_sample_data():
     """Initialize sample data if needed"""
-    products_db = load_json(PRODUCTS_DB)
-    if not products_db.get("products") or len(products_db.get("products", [])) < 3:
-        print("Initializing products database...")
-        sample_products = {
-            "products": [
-                {
-                    "id": "prod_001",
-                    "company_id": "comp_001",
-                    "name": "Apple iPhone 15 Pro",
-                    "category": "Electronics",
-                    "description": "Latest flagship smartphone with A17 Pro chip and titanium design",
-                    "brand": "Apple",
-                    "rating": 4.8,
-                    "variants": []
-                },
-                {
-                    "id": "prod_002",
-                    "company_id": "comp_001",
-                    "name": "Samsung Galaxy S24 Ultra",
-                    "category": "Electronics",
-                    "description": "Premium Android smartphone with S Pen and 200MP camera",
-                    "brand": "Samsung",
-                    "rating": 4.7,
-                    "variants": []
-                },
-                {
-                    "id": "prod_003",
-                    "company_id": "comp_001",
-                    "name": "Nike Air Max 270",
-                    "category": "Sports",
-                    "description": "Comfortable running shoes with Max Air cushioning",
-                    "brand": "Nike",
-                    "rating": 4.5,
-                    "variants": []
-                },
-                {
-                    "id": "prod_004",
-                    "company_id": "comp_001",
-                    "name": "Sony WH-1000XM5",
-                    "category": "Electronics",
-                    "description": "Premium noise-cancelling wireless headphones",
-                    "brand": "Sony",
-                    "rating": 4.9,
-                    "variants": []
-                },
-                {
-                    "id": "prod_005",
-                    "company_id": "comp_001",
-                    "name": "Levi's 501 Original Jeans",
-                    "category": "Fashion",
-                    "description": "Classic straight fit denim jeans",
-                    "brand": "Levi's",
-                    "rating": 4.6,
-                    "variants": []
-                }
-            ]
-        }
-        save_json(PRODUCTS_DB, sample_products)
-        print("✅ Products database initialized!\n")
-    
-    sales_db = load_json(SALES_DB)
-    if not sales_db.get("sales") or len(sales_db.get("sales", [])) < 2:
-        print("Initializing sales database...")
-        sample_sales = {
-            "sales": [
-                {
-                    "id": "sale_001",
-                    "company_id": "comp_001",
-                    "customer_id": "cust_001",
-                    "invoice_number": "INV-2025-001",
-                    "total": 79999,
-                    "discount": 0,
-                    "payment_status": "PAID",
-                    "created_at": "2025-02-15T14:22:00Z",
-                    "items": []
-                },
-                {
-                    "id": "sale_002",
-                    "company_id": "comp_001",
-                    "customer_id": "cust_002",
-                    "invoice_number": "INV-2025-002",
-                    "total": 24999,
-                    "discount": 1000,
-                    "payment_status": "PENDING",
-                    "created_at": "2025-02-16T10:15:00Z",
-                    "items": []
-                }
-            ]
-        }
-        save_json(SALES_DB, sample_sales)
-        print("✅ Sales database initialized!\n")
-    
-    vendors_db = load_json(VENDORS_DB)
-    if not vendors_db.get("vendors"):
-        print("Initializing vendors database...")
-        sample_vendors = {
-            "vendors": [
-                {
-                    "id": "vendor_001",
-                    "name": "Tech Supplies India",
-                    "contact": "Rajesh Kumar",
-                    "email": "rajesh@techsupplies.in",
-                    "phone": "+91-9876543210"
-                },
-                {
-                    "id": "vendor_002",
-                    "name": "Fashion Wholesale Co",
-                    "contact": "Priya Sharma",
-                    "email": "priya@fashionwholesale.com",
-                    "phone": "+91-9876543211"
-                }
-            ]
-        }
-        save_json(VENDORS_DB, sample_vendors)
-        print("✅ Vendors database initialized!\n")
+    for filepath, collection, min_records in _SAMPLE_DATABASES:
+        if len(load_json_ro(filepath).get(collection, [])) >= min_records:
+            continue
+        print(f"Initializing {collection} database...")
+        shutil.copyfile(os.path.join(SAMPLES_DIR, os.path.basename(filepath)), filepath)
+        _JSON_CACHE.pop(filepath, None)
+        print(f"✅ {collection.capitalize()} database initialized!\n")
 
 # Main application
 def main():
@@ -1245,7 +1850,7 @@ def main():
     print("  • 🏢 Manage vendor information")
     print("  • ➕ Create and update products and sales")
     print("\nJust chat naturally - I'll understand what you need!")
-    print("\nCommands: 'quit' to exit | 'reset' to start fresh")
+    print("\nCommands: 'quit' to exit | 'reset' to start fresh | '/stats' for node timings")
     print("=" * 60 + "\n")
     
     try:
@@ -1254,6 +1859,9 @@ def main():
         print(f"⚠️  Error initializing data: {e}\n")
     
     chatbot = EnhancedChatbot()
+    # One event loop for the whole session so the async Groq client keeps
+    # its connections between turns
+    loop = asyncio.new_event_loop()
     
     while True:
         try:
@@ -1268,12 +1876,31 @@ def main():
                 print("\n✅ Memory reset! Starting fresh conversation.")
                 continue
             
+            if user_input.lower() == "/stats":
+                stats = get_node_stats()
+                if not stats:
+                    print("\n📈 No node timings yet.")
+                    continue
+                print("\n📈 Node timings (cumulative):")
+                for name, total, calls in stats:
+                    print(f"  • {name}: {total * 1000:.1f} ms over {calls} call(s), {total * 1000 / calls:.1f} ms avg")
+                continue
+            
             if not user_input:
                 continue
             
             print("\n🤖 Assistant: ", end="")
-            response = chatbot.process_message(user_input)
-            print(response)
+            streamed = []
+            
+            def print_token(text: str):
+                streamed.append(text)
+                print(text, end="", flush=True)
+            
+            response = loop.run_until_complete(chatbot.process_message(user_input, on_token=print_token))
+            if streamed:
+                print()  # the reply is already on screen
+            else:
+                print(response)
         
         except KeyboardInterrupt:
             print("\n\n👋 Chat interrupted. Goodbye!")
@@ -1282,6 +1909,10 @@ def main():
             print(f"\n❌ Error: {e}")
             print("Please try again or type 'reset' to start fresh.")
             continue
+    
+    flush_writes()
+    loop.run_until_complete(aclient.close())
+    loop.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file